@@ -405,7 +405,10 @@ router.put('/profile', async (req, res) => {
 // Helper function to run Python script
 const runPythonScript = (scriptPath, args = []) => {
   return new Promise((resolve, reject) => {
-    const python = spawn('./venv/bin/python3', [scriptPath, ...args]);
+    // Single-threaded OpenMP avoids oversubscription in per-request model inference
+    const python = spawn('./venv/bin/python3', [scriptPath, ...args], {
+      env: { ...process.env, OMP_NUM_THREADS: process.env.OMP_NUM_THREADS || '1' }
+    });
     let dataString = '';
     let errorString = '';
 
@@ -1,5 +1,6 @@
 import pandas as pd
 import numpy as np
+import scipy.sparse as sp
 from sklearn.model_selection import train_test_split
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.naive_bayes import MultinomialNB
@@ -9,13 +10,107 @@ from sklearn.neighbors import KNeighborsClassifier
 from sklearn.linear_model import LogisticRegression
 from sklearn.neural_network import MLPClassifier
 from sklearn.metrics import classification_report
+from sklearn.utils import Bunch
 import json
+import copy
+import functools
 import os
 import pickle
+import shutil
+import tempfile
+import threading
 from datetime import datetime
 import warnings
 warnings.filterwarnings('ignore')
 
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+# Diseases that raise the severity score; Bronchial Asthma is flagged as
+# an emergency but scored like other diseases
+_EMERGENCY_SEVERE = frozenset({
+    'Heart attack', 'Paralysis (brain hemorrhage)', 'Tuberculosis',
+    'AIDS', 'Malaria', 'Typhoid', 'Pneumonia'
+})
+# Diseases flagged as emergencies in the response
+_EMERGENCY_ALL = _EMERGENCY_SEVERE | {'Bronchial Asthma'}
+
+# Severity labels indexed by the ids in _SEVERITY_TABLE
+_SEVERITY_LEVELS = ('low', 'medium', 'high', 'critical')
+
+# Severity rules for ordinary (row 0) and severe emergency (row 1) diseases:
+# the first cut-off the confidence exceeds picks the id at the same
+# position, otherwise the last id applies
+_SEVERITY_TABLE = (
+    ((0.9, 0.7, 0.5), (0, 1, 2, 3)),
+    ((0.8, 0.6), (3, 2, 1)),
+)
+
+# The same table as padded arrays for the batch kernel; padding cut-offs
+# are -inf, which any real confidence exceeds, and map to the last id
+_SEVERITY_WIDTH = max(len(cuts) for cuts, _ in _SEVERITY_TABLE)
+_SEVERITY_CUTS = np.array([
+    cuts + (-np.inf,) * (_SEVERITY_WIDTH - len(cuts)) for cuts, _ in _SEVERITY_TABLE
+])
+_SEVERITY_IDS = np.array([
+    ids + (ids[-1],) * (_SEVERITY_WIDTH + 1 - len(ids)) for _, ids in _SEVERITY_TABLE
+], dtype=np.int8)
+
+def _severity_id(confidence, severe):
+    """
+    Severity id for one confidence using _SEVERITY_TABLE
+    """
+    cuts, ids = _SEVERITY_TABLE[1 if severe else 0]
+    for cut, severity_id in zip(cuts, ids):
+        if confidence > cut:
+            return severity_id
+    return ids[-1]
+
+def _top_k_indices(probabilities, k=5):
+    """
+    Indices of the k highest probabilities, highest first; ties keep class
+    order, as a stable sort over all classes would
+    """
+    n = len(probabilities)
+    k = min(k, n)
+    kth = np.partition(probabilities, n - k)[n - k]
+    above = np.flatnonzero(probabilities > kth)
+    tied = np.flatnonzero(probabilities == kth)[:k - len(above)]
+    idx = np.concatenate([above, tied])
+    return idx[np.argsort(-probabilities[idx], kind='stable')]
+
+def _severity_scores(pred, conf, mask, cuts, ids):
+    """
+    Batch version of _severity_id on class ids, driven by the padded
+    _SEVERITY_CUTS/_SEVERITY_IDS arrays
+    """
+    out = np.empty(pred.shape[0], dtype=np.int8)
+    for i in range(pred.shape[0]):
+        row = 1 if mask[pred[i]] else 0
+        j = 0
+        while j < cuts.shape[1] and not conf[i] > cuts[row, j]:
+            j += 1
+        out[i] = ids[row, j]
+    return out
+
+_severity_kernel = None
+
+def _get_severity_kernel():
+    """
+    Compile _severity_scores with numba on first use, or fall back to
+    plain Python when numba is not installed
+    """
+    global _severity_kernel
+    if _severity_kernel is None:
+        try:
+            from numba import njit
+            _severity_kernel = njit(cache=True)(_severity_scores)
+        except ImportError:
+            _severity_kernel = _severity_scores
+    return _severity_kernel
+
 class SymptomAnalyzer:
     def __init__(self, dataset_path=None, model_path=None):
         """
@@ -24,9 +119,18 @@ class SymptomAnalyzer:
         self.dataset_path = dataset_path or "/Users/monishbalusu/Desktop/health-portal-api/dataset/ds.csv"
         self.model_path = model_path or "/Users/monishbalusu/Desktop/health-portal-api/Models"
         self.vectorizer = None
+        self._idf = None
+        self._analyze = None
+        self._symptom_terms = None
         self.models = {}
         self.best_model = None
-        self.df = None
+        self._best_model_key = None
+        self._emergency_masks = {}
+        self.best_model_compiled = None
+        self._df = None
+        self._df_loaded = False
+        self._disease_info_cache = {}
+        self._symptom_cols = []
         self.symptoms_list = None
         
         # Create models directory if it doesn't exist
@@ -39,6 +143,10 @@ class SymptomAnalyzer:
         """
         Load existing enhanced models or fallback to basic model
         """
+        # Cached vectors and masks belong to the previous models
+        self._vec_cache = functools.lru_cache(maxsize=4096)(self._vectorize)
+        self._emergency_masks = {}
+        
         enhanced_model_file = os.path.join(self.model_path, "enhanced_symptom_model.pkl")
         enhanced_vectorizer_file = os.path.join(self.model_path, "enhanced_vectorizer.pkl")
         
@@ -49,8 +157,11 @@ class SymptomAnalyzer:
                     self.models = pickle.load(f)
                 with open(enhanced_vectorizer_file, 'rb') as f:
                     self.vectorizer = pickle.load(f)
+                self._prepare_fast_transform()
+                self._prune_ensemble()
                 self._set_best_model()
-                self._load_dataset()
+                self._compile_best_model(enhanced_model_file)
+                self._load_symptoms_list()
                 return
             except Exception as e:
                 print(f"Failed to load enhanced models: {e}")
@@ -65,8 +176,9 @@ class SymptomAnalyzer:
                     self.model = pickle.load(f)
                 with open(vectorizer_file, 'rb') as f:
                     self.vectorizer = pickle.load(f)
+                self._prepare_fast_transform()
                 self.best_model = self.model
-                self._load_dataset()
+                self._load_symptoms_list()
                 return
             except Exception as e:
                 print(f"Failed to load basic models: {e}")
@@ -75,17 +187,126 @@ class SymptomAnalyzer:
         print("Training new basic model...")
         self._train_basic_model()
     
+    @property
+    def df(self):
+        """
+        Dataset, loaded on first access since only get_disease_info needs it
+        """
+        if not self._df_loaded:
+            self._load_dataset()
+        return self._df
+    
+    @df.setter
+    def df(self, value):
+        self._df = value
+        self._df_loaded = True
+        self._disease_info_cache = {}
+    
+    def _load_symptoms_list(self):
+        """
+        Load the pickled symptoms list, reading the dataset only if it is missing
+        """
+        symptoms_file = os.path.join(self.model_path, "symptoms_list.pkl")
+        
+        try:
+            if os.path.exists(symptoms_file) and (
+                not os.path.exists(self.dataset_path)
+                or os.path.getmtime(symptoms_file) >= os.path.getmtime(self.dataset_path)
+            ):
+                with open(symptoms_file, 'rb') as f:
+                    self.symptoms_list = pickle.load(f)
+                return
+        except Exception as e:
+            print(f"Failed to load symptoms list: {e}")
+        
+        self._load_dataset()
+        self._save_symptoms_list()
+    
+    def _save_symptoms_list(self):
+        """
+        Save the symptoms list next to the models
+        """
+        if self.symptoms_list is None:
+            return
+        
+        symptoms_file = os.path.join(self.model_path, "symptoms_list.pkl")
+        
+        def write(path):
+            with open(path, 'wb') as f:
+                pickle.dump(self.symptoms_list, f)
+        
+        try:
+            self._replace_atomically(symptoms_file, write)
+        except Exception as e:
+            print(f"Failed to save symptoms list: {e}")
+    
     def _load_dataset(self):
         """
         Load the dataset for symptom list extraction
         """
+        parquet_path = self._parquet_path()
+        
         try:
-            self.df = pd.read_csv(self.dataset_path, encoding="ISO-8859-1")
+            use_parquet = (
+                pyarrow is not None and os.path.exists(parquet_path)
+                and (not os.path.exists(self.dataset_path)
+                     or os.path.getmtime(parquet_path) >= os.path.getmtime(self.dataset_path))
+            )
+            if use_parquet:
+                self.df = pd.read_parquet(parquet_path, engine='pyarrow')
+            else:
+                self.df = pd.read_csv(self.dataset_path, encoding="ISO-8859-1")
+            
+            self._symptom_cols = [c for c in self.df.columns if c.lower().startswith("symptom")]
+            if not use_parquet:
+                self._write_parquet(self.df)
             self._extract_symptoms_list()
         except Exception as e:
             print(f"Error loading dataset: {e}")
             self.df = None
     
+    def _parquet_path(self):
+        """
+        Path of the parquet copy stored next to the CSV dataset
+        """
+        return os.path.splitext(self.dataset_path)[0] + ".parquet"
+    
+    def _replace_atomically(self, path, write):
+        """
+        Write to a temp file in the same directory, then move it into place
+        so concurrent readers never see a partial file
+        """
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".tmp")
+        os.close(fd)
+        try:
+            write(tmp_path)
+            # mkstemp creates 0600 files; give them the usual umask mode
+            umask = os.umask(0)
+            os.umask(umask)
+            os.chmod(tmp_path, 0o666 & ~umask)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+    
+    def _write_parquet(self, df):
+        """
+        Save a categorical parquet copy of the dataset for faster loads
+        """
+        if pyarrow is None:
+            return
+        
+        try:
+            cols = [c for c in ["Disease"] + self._symptom_cols if c in df.columns]
+            categorical = df.astype({c: 'category' for c in cols})
+            self._replace_atomically(
+                self._parquet_path(),
+                lambda path: categorical.to_parquet(path, engine='pyarrow')
+            )
+        except Exception as e:
+            print(f"Failed to write parquet dataset: {e}")
+    
     def _extract_symptoms_list(self):
         """
         Extract unique symptoms from the dataset
@@ -93,30 +314,176 @@ class SymptomAnalyzer:
         if self.df is None:
             return
         
-        symptom_cols = [c for c in self.df.columns if c.lower().startswith("symptom")]
-        all_symptoms = set()
+        if self._symptom_cols and all(
+            isinstance(self.df[c].dtype, pd.CategoricalDtype) for c in self._symptom_cols
+        ):
+            # Categories already hold the distinct values of each column
+            cat_union = set().union(*[self.df[c].cat.categories for c in self._symptom_cols])
+            self.symptoms_list = sorted({str(s).strip() for s in cat_union} - {""})
+            return
         
-        for col in symptom_cols:
-            symptoms = self.df[col].dropna().astype(str)
-            for symptom in symptoms:
-                if symptom.strip():
-                    all_symptoms.add(symptom.strip())
+        vals = self.df[self._symptom_cols].stack().dropna().astype(str).str.strip()
+        vals = vals[vals != ""]
+        self.symptoms_list = sorted(vals.unique().tolist())
+    
+    def _prune_ensemble(self):
+        """
+        Drop SVC and KNN members from the soft-voting ensemble, whose
+        predict_proba cost grows with the training set
+        """
+        ensemble = self.models.get('Ensemble')
+        if not isinstance(ensemble, VotingClassifier) or ensemble.voting != 'soft':
+            return
         
-        self.symptoms_list = sorted(list(all_symptoms))
+        # estimators_ lines up with the non-dropped entries of estimators
+        active = [(i, name) for i, (name, est) in enumerate(ensemble.estimators) if est != 'drop']
+        keep = [j for j, est in enumerate(ensemble.estimators_)
+                if not isinstance(est, (SVC, KNeighborsClassifier))]
+        if not keep or len(keep) == len(ensemble.estimators_):
+            return
+        
+        if ensemble.weights is not None:
+            ensemble.weights = [ensemble.weights[active[j][0]] for j in keep]
+        ensemble.estimators = [ensemble.estimators[active[j][0]] for j in keep]
+        ensemble.estimators_ = [ensemble.estimators_[j] for j in keep]
+        ensemble.named_estimators_ = Bunch(**{
+            active[j][1]: est for j, est in zip(keep, ensemble.estimators_)
+        })
     
     def _set_best_model(self):
         """
         Set the best model from loaded models
         """
-        if 'Ensemble' in self.models:
-            self.best_model = self.models['Ensemble']
-        elif 'GradientBoosting' in self.models:
-            self.best_model = self.models['GradientBoosting']
-        elif 'RandomForest' in self.models:
-            self.best_model = self.models['RandomForest']
+        for key in ('Ensemble', 'GradientBoosting', 'RandomForest'):
+            if key in self.models:
+                break
         else:
             # Use the first available model
-            self.best_model = list(self.models.values())[0]
+            key = list(self.models)[0]
+        self._best_model_key = key
+        self.best_model = self.models[key]
+    
+    def _compile_best_model(self, source_file):
+        """
+        Compile the best model to ONNX with Hummingbird for faster inference.
+        Opt-in via SYMPTOM_ANALYZER_COMPILE=1, since importing hummingbird,
+        torch and onnxruntime outweighs the saving for one row per process
+        """
+        self.best_model_compiled = None
+        if self.best_model is None or os.environ.get("SYMPTOM_ANALYZER_COMPILE") != "1":
+            return
+        
+        # Tie the compiled copy to the source pickle and the chosen model so
+        # a retrained, pruned or re-selected model never reuses a stale one
+        stat = os.stat(source_file)
+        compiled_file = os.path.join(
+            self.model_path,
+            f"compiled_{self._best_model_key}_{stat.st_mtime_ns:x}_{stat.st_size:x}_onnx"
+        )
+        failed_marker = compiled_file + ".failed"
+        
+        # Conversion already failed for this model; don't retry every request
+        if os.path.exists(failed_marker):
+            return
+        
+        try:
+            import hummingbird.ml as hummingbird_ml
+        except ImportError:
+            return
+        
+        # Hummingbird saves and loads through a directory named after the
+        # archive, so work in a private temp dir to keep processes apart
+        tmp_dir = tempfile.mkdtemp(dir=self.model_path)
+        tmp_file = os.path.join(tmp_dir, "model")
+        
+        try:
+            if os.path.exists(compiled_file + ".zip"):
+                try:
+                    shutil.copyfile(compiled_file + ".zip", tmp_file + ".zip")
+                    self.best_model_compiled = hummingbird_ml.load(tmp_file)
+                except Exception as e:
+                    print(f"Failed to load compiled model, using sklearn: {e}")
+                return
+            
+            try:
+                sample = self.vectorizer.transform([""]).toarray()
+                compiled = hummingbird_ml.convert(self.best_model, 'onnx', test_input=sample)
+            except Exception as e:
+                # Only a failed conversion is permanent for this model
+                print(f"Failed to compile best model, using sklearn: {e}")
+                try:
+                    open(failed_marker, 'w').close()
+                except OSError:
+                    pass
+                return
+            
+            self.best_model_compiled = compiled
+            try:
+                compiled.save(tmp_file)
+                os.replace(tmp_file + ".zip", compiled_file + ".zip")
+            except Exception as e:
+                print(f"Failed to save compiled model: {e}")
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+    
+    def _vectorize(self, key):
+        """
+        Vectorize a normalized symptom tuple (wrapped by the LRU cache)
+        """
+        return self._fast_transform(key)
+    
+    def _prepare_fast_transform(self):
+        """
+        Cache the IDF vector so symptoms can be vectorized by term index
+        """
+        v = self.vectorizer
+        supported = (
+            isinstance(v, TfidfVectorizer) and v.analyzer == 'word'
+            and v.ngram_range == (1, 1) and v.use_idf and v.norm == 'l2'
+            and not v.binary and not v.sublinear_tf
+        )
+        self._idf = np.asarray(v.idf_) if supported else None
+        self._analyze = v.build_analyzer() if supported else None
+        # Bounded so arbitrary user strings can't grow it without limit
+        self._symptom_terms = functools.lru_cache(maxsize=4096)(self._tokenize_symptom)
+    
+    def _tokenize_symptom(self, symptom):
+        """
+        Vocabulary indices of a symptom's terms (wrapped by an LRU cache)
+        """
+        vocab = self.vectorizer.vocabulary_
+        return tuple(vocab[t] for t in self._analyze(symptom) if t in vocab)
+    
+    def _fast_transform(self, symptoms):
+        """
+        Build the TF-IDF row directly from per-symptom term indices
+        """
+        if self._idf is None:
+            return self.vectorizer.transform([" ".join(symptoms)])
+        
+        # Tokenize each symptom once, then reuse its term indices
+        indices = []
+        for symptom in symptoms:
+            indices.extend(self._symptom_terms(symptom))
+        
+        cols, counts = np.unique(np.asarray(indices, dtype=np.intp), return_counts=True)
+        data = counts * self._idf[cols]
+        norm = np.sqrt(data @ data)
+        if norm > 0:
+            data /= norm
+        return sp.csr_matrix((data, cols, [0, len(cols)]), shape=(1, len(self._idf)))
+    
+    def _predict_proba(self, model, X):
+        """
+        Get class probabilities, using the compiled best model when available
+        """
+        if model is self.best_model and self.best_model_compiled is not None:
+            try:
+                return self.best_model_compiled.predict_proba(X.toarray())
+            except Exception as e:
+                print(f"Compiled model failed, using sklearn: {e}")
+                self.best_model_compiled = None
+        return model.predict_proba(X)
     
     def _train_basic_model(self):
         """
@@ -127,9 +494,11 @@ class SymptomAnalyzer:
             self.df = pd.read_csv(self.dataset_path, encoding="ISO-8859-1")
             
             # Combine multiple symptom columns into one string
-            symptom_cols = [c for c in self.df.columns if c.lower().startswith("symptom")]
-            self.df[symptom_cols] = self.df[symptom_cols].fillna("")
-            self.df["All_Symptoms"] = self.df[symptom_cols].apply(lambda row: " ".join(row.values), axis=1)
+            self._symptom_cols = [c for c in self.df.columns if c.lower().startswith("symptom")]
+            self._write_parquet(self.df)
+            self.df[self._symptom_cols] = self.df[self._symptom_cols].fillna("")
+            cols = [self.df[c].astype(str) for c in self._symptom_cols]
+            self.df["All_Symptoms"] = cols[0].str.cat(cols[1:], sep=" ")
             
             # Features and labels
             X = self.df["All_Symptoms"]
@@ -144,6 +513,7 @@ class SymptomAnalyzer:
             self.vectorizer = TfidfVectorizer()
             X_train_vec = self.vectorizer.fit_transform(X_train)
             X_test_vec = self.vectorizer.transform(X_test)
+            self._prepare_fast_transform()
             
             # Train basic model
             self.model = MultinomialNB()
@@ -161,8 +531,9 @@ class SymptomAnalyzer:
             
             print(f"Basic model saved to {model_file}")
             
-            # Extract symptoms list
+            # Extract and save symptoms list
             self._extract_symptoms_list()
+            self._save_symptoms_list()
             
         except Exception as e:
             print(f"Error training basic model: {e}")
@@ -201,26 +572,22 @@ class SymptomAnalyzer:
             }
         
         try:
-            # Convert symptoms to string format
-            symptoms_str = " ".join(symptoms)
-            
-            # Vectorize symptoms
-            symptoms_vec = self.vectorizer.transform([symptoms_str])
-            
-            # Get prediction
-            prediction = model.predict(symptoms_vec)[0]
+            # Vectorize symptoms; TF-IDF ignores order, so sort for the cache key
+            key = tuple(sorted(s.strip().lower() for s in symptoms))
+            symptoms_vec = self._vec_cache(key)
             
-            # Get confidence scores for all diseases
-            probabilities = model.predict_proba(symptoms_vec)[0]
+            # Get confidence scores for all diseases; the prediction is the
+            # most probable class, so predict() would only repeat this pass
+            probabilities = self._predict_proba(model, symptoms_vec)[0]
+            top_idx = int(np.argmax(probabilities))
+            prediction = model.classes_[top_idx]
             
-            # Get top 5 predictions with confidence scores
-            top_predictions = []
-            for disease, score in sorted(zip(model.classes_, probabilities), 
-                                      key=lambda x: x[1], reverse=True)[:5]:
-                top_predictions.append({
-                    "disease": disease,
-                    "confidence": float(score)
-                })
+            # Get top 5 predictions with confidence scores (partial sort)
+            idx = _top_k_indices(probabilities)
+            top_predictions = [{
+                "disease": model.classes_[i],
+                "confidence": float(probabilities[i])
+            } for i in idx]
             
             # Get confidence for the top prediction
             top_confidence = top_predictions[0]["confidence"] if top_predictions else 0
@@ -236,7 +603,7 @@ class SymptomAnalyzer:
                 "confidence": float(top_confidence),
                 "confidencePercentage": round(top_confidence * 100, 2),
                 "topPredictions": top_predictions,
-                "analysisDate": datetime.now().isoformat(),
+                "analysisDate": datetime.now().isoformat(timespec='microseconds'),
                 "modelVersion": "2.0" if len(self.models) > 1 else "1.0",
                 "modelUsed": used_model,
                 "severity": severity,
@@ -250,41 +617,109 @@ class SymptomAnalyzer:
                 "success": False
             }
     
-    def _determine_severity(self, confidence, disease):
+    def analyze_symptoms_batch(self, batch, model_name=None):
         """
-        Determine severity level based on confidence and disease type
+        Analyze several symptom lists at once with a single vectorizer/model pass
         """
-        emergency_diseases = [
-            'Heart attack', 'Paralysis (brain hemorrhage)', 'Tuberculosis',
-            'AIDS', 'Malaria', 'Typhoid', 'Pneumonia'
-        ]
+        if not batch:
+            return []
         
-        if disease in emergency_diseases:
-            if confidence > 0.8:
-                return 'critical'
-            elif confidence > 0.6:
-                return 'high'
-            else:
-                return 'medium'
+        # Select model
+        if model_name and model_name in self.models:
+            model = self.models[model_name]
+            used_model = model_name
         else:
-            if confidence > 0.9:
-                return 'low'
-            elif confidence > 0.7:
-                return 'medium'
-            elif confidence > 0.5:
-                return 'high'
-            else:
-                return 'critical'
+            model = self.best_model
+            used_model = "best"
+        
+        if model is None:
+            return [{"error": "Model not loaded", "success": False} for _ in batch]
+        
+        results = [{"error": "No symptoms provided", "success": False} for _ in batch]
+        rows = [i for i, symptoms in enumerate(batch) if symptoms]
+        if not rows:
+            return results
+        
+        try:
+            # Vectorize all symptom lists in one call
+            texts = [" ".join(batch[i]) for i in rows]
+            X = self.vectorizer.transform(texts)
+            
+            # Confidence scores for every row
+            probs = np.asarray(self._predict_proba(model, X), dtype=np.float64)
+            
+            # Top 5 per row without sorting all classes
+            top_idx = [_top_k_indices(p) for p in probs]
+            
+            # Severity and emergency flags for the whole batch by class id
+            pred_ids = np.array([idx[0] for idx in top_idx], dtype=np.intp)
+            top_conf = np.ascontiguousarray(probs[np.arange(len(rows)), pred_ids])
+            severe_mask, emergency_mask = self._get_emergency_masks(used_model, model)
+            severity_ids = _get_severity_kernel()(
+                pred_ids, top_conf, severe_mask, _SEVERITY_CUTS, _SEVERITY_IDS
+            )
+            
+            analysis_date = datetime.now().isoformat(timespec='microseconds')
+            model_version = "2.0" if len(self.models) > 1 else "1.0"
+            
+            for row, i in enumerate(rows):
+                top_predictions = [{
+                    "disease": model.classes_[j],
+                    "confidence": float(probs[row, j])
+                } for j in top_idx[row]]
+                
+                prediction = top_predictions[0]["disease"]
+                top_confidence = top_predictions[0]["confidence"]
+                severity = _SEVERITY_LEVELS[severity_ids[row]]
+                
+                results[i] = {
+                    "success": True,
+                    "symptoms": batch[i],
+                    "predictedDisease": prediction,
+                    "confidence": top_confidence,
+                    "confidencePercentage": round(top_confidence * 100, 2),
+                    "topPredictions": top_predictions,
+                    "analysisDate": analysis_date,
+                    "modelVersion": model_version,
+                    "modelUsed": used_model,
+                    "severity": severity,
+                    "isEmergency": bool(emergency_mask[pred_ids[row]]),
+                    "recommendations": self._get_recommendations(prediction, severity)
+                }
+            
+            return results
+            
+        except Exception as e:
+            return [{
+                "error": f"Analysis failed: {str(e)}",
+                "success": False
+            } for _ in batch]
+    
+    def _get_emergency_masks(self, used_model, model):
+        """
+        Boolean masks over model.classes_ for severe and all emergency
+        diseases, built once per model
+        """
+        masks = self._emergency_masks.get(used_model)
+        if masks is None:
+            masks = (
+                np.isin(model.classes_, list(_EMERGENCY_SEVERE)),
+                np.isin(model.classes_, list(_EMERGENCY_ALL))
+            )
+            self._emergency_masks[used_model] = masks
+        return masks
+    
+    def _determine_severity(self, confidence, disease):
+        """
+        Determine severity level based on confidence and disease type
+        """
+        return _SEVERITY_LEVELS[_severity_id(confidence, disease in _EMERGENCY_SEVERE)]
     
     def _is_emergency_disease(self, disease):
         """
         Check if the disease is considered an emergency
         """
-        emergency_diseases = [
-            'Heart attack', 'Paralysis (brain hemorrhage)', 'Tuberculosis',
-            'AIDS', 'Malaria', 'Typhoid', 'Pneumonia', 'Bronchial Asthma'
-        ]
-        return disease in emergency_diseases
+        return disease in _EMERGENCY_ALL
     
     def _get_recommendations(self, disease, severity):
         """
@@ -322,29 +757,33 @@ class SymptomAnalyzer:
         if self.df is None:
             return {"error": "Dataset not loaded"}
         
+        # Serve repeat lookups from the cache; copy so callers can't mutate it
+        key = disease_name.lower()
+        cached = self._disease_info_cache.get(key)
+        if cached is not None:
+            result = copy.deepcopy(cached)
+            result["disease"] = disease_name
+            return result
+        
         try:
             # Filter dataset for the specific disease
-            disease_data = self.df[self.df["Disease"].str.lower() == disease_name.lower()]
+            disease_data = self.df[self.df["Disease"].str.lower() == key]
             
             if disease_data.empty:
                 return {"error": f"Disease '{disease_name}' not found in dataset"}
             
             # Get all symptoms for this disease
-            symptom_cols = [c for c in self.df.columns if c.lower().startswith("symptom")]
-            all_symptoms = set()
+            arr = pd.unique(disease_data[self._symptom_cols].to_numpy(dtype=object).ravel())
+            all_symptoms = {s.strip() for s in arr if isinstance(s, str) and s.strip() and s != 'nan'}
             
-            for _, row in disease_data.iterrows():
-                for col in symptom_cols:
-                    symptom = str(row[col]).strip()
-                    if symptom and symptom != 'nan':
-                        all_symptoms.add(symptom)
-            
-            return {
+            result = {
                 "disease": disease_name,
                 "commonSymptoms": sorted(list(all_symptoms)),
                 "occurrenceCount": len(disease_data),
                 "success": True
             }
+            self._disease_info_cache[key] = copy.deepcopy(result)
+            return result
             
         except Exception as e:
             return {
@@ -354,6 +793,7 @@ class SymptomAnalyzer:
 
 # Global analyzer instance
 analyzer = None
+_LOCK = threading.Lock()
 
 def get_analyzer():
     """
@@ -361,7 +801,10 @@ def get_analyzer():
     """
     global analyzer
     if analyzer is None:
-        analyzer = SymptomAnalyzer()
+        # Double-checked so concurrent first requests load the models once
+        with _LOCK:
+            if analyzer is None:
+                analyzer = SymptomAnalyzer()
     return analyzer
 
 def analyze_symptoms(symptoms, model_name=None):
@@ -392,6 +835,13 @@ def analyze_symptoms_api(symptoms):
     analyzer = get_analyzer()
     return analyzer.analyze_symptoms(symptoms)
 
+def analyze_symptoms_api_batch(batch):
+    """
+    API function for batched symptom analysis (used by routes)
+    """
+    analyzer = get_analyzer()
+    return analyzer.analyze_symptoms_batch(batch)
+
 def get_symptoms_api():
     """
     API function to get available symptoms (used by routes)
@@ -0,0 +1,148 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+import symptom_analyzer
+from symptom_analyzer import SymptomAnalyzer
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def baseline_severity(confidence, disease):
+    """
+    Severity rules as originally written in _determine_severity
+    """
+    emergency_diseases = [
+        'Heart attack', 'Paralysis (brain hemorrhage)', 'Tuberculosis',
+        'AIDS', 'Malaria', 'Typhoid', 'Pneumonia'
+    ]
+    if disease in emergency_diseases:
+        if confidence > 0.8:
+            return 'critical'
+        elif confidence > 0.6:
+            return 'high'
+        else:
+            return 'medium'
+    else:
+        if confidence > 0.9:
+            return 'low'
+        elif confidence > 0.7:
+            return 'medium'
+        elif confidence > 0.5:
+            return 'high'
+        else:
+            return 'critical'
+
+
+def baseline_top5(probabilities):
+    """
+    Top 5 class indices as originally picked with a stable sorted()
+    """
+    ranked = sorted(enumerate(probabilities), key=lambda x: x[1], reverse=True)
+    return [i for i, _ in ranked[:5]]
+
+
+class SymptomAnalyzerTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        """
+        Build an analyzer on copies of the shipped basic model and dataset
+        """
+        os.environ.pop("SYMPTOM_ANALYZER_COMPILE", None)
+        cls.tmp_dir = tempfile.mkdtemp()
+        model_dir = os.path.join(cls.tmp_dir, "Models")
+        os.makedirs(model_dir)
+        for name in ("symptom_model.pkl", "vectorizer.pkl"):
+            shutil.copy(os.path.join(BASE_DIR, "Models", name), model_dir)
+        dataset = os.path.join(cls.tmp_dir, "ds.csv")
+        shutil.copy(os.path.join(BASE_DIR, "dataset", "ds.csv"), dataset)
+
+        cls.analyzer = SymptomAnalyzer(dataset_path=dataset, model_path=model_dir)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.tmp_dir, ignore_errors=True)
+
+    def test_fast_transform_matches_vectorizer(self):
+        # The shipped vectorizer must take the index-based path
+        self.assertIsNotNone(self.analyzer._idf)
+
+        symptoms = self.analyzer.get_available_symptoms()
+        cases = [[s] for s in symptoms]
+        cases += [symptoms[i:i + 4] for i in range(0, len(symptoms), 7)]
+        cases += [
+            ["itching", "itching", "skin_rash"],
+            ["not a symptom"],
+            [" dischromic _patches", "Skin_Rash "],
+        ]
+
+        for case in cases:
+            key = tuple(sorted(s.strip().lower() for s in case))
+            expected = self.analyzer.vectorizer.transform([" ".join(case)]).toarray()
+            actual = self.analyzer._fast_transform(key).toarray()
+            np.testing.assert_allclose(actual, expected, rtol=1e-12, atol=1e-15,
+                                       err_msg=str(case))
+
+    def test_top_k_matches_stable_sort(self):
+        model = self.analyzer.best_model
+        cases = [
+            model.predict_proba(self.analyzer.vectorizer.transform([text]))[0]
+            for text in ["itching skin_rash", "headache", "vomiting fatigue high_fever"]
+        ]
+        n = len(model.classes_)
+        ties = np.zeros(n)
+        ties[[3, 7, 12]] = 0.2
+        ties[[1, 9, 20, 30]] = 0.1
+        cases += [ties, np.zeros(n), np.full(n, 1.0 / n), np.array([0.5, 0.25, 0.25])]
+
+        for probabilities in cases:
+            self.assertEqual(
+                list(symptom_analyzer._top_k_indices(probabilities)),
+                baseline_top5(probabilities)
+            )
+
+    def test_severity_matches_baseline_rules(self):
+        confidences = [0.0, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0, float('nan')]
+        for cut in (0.5, 0.6, 0.7, 0.8, 0.9):
+            confidences += [np.nextafter(cut, 2.0), np.nextafter(cut, -1.0)]
+        diseases = ['Malaria', 'Heart attack', 'Bronchial Asthma', 'Acne']
+
+        classes = np.array(diseases)
+        mask = np.isin(classes, list(symptom_analyzer._EMERGENCY_SEVERE))
+        pred = np.repeat(np.arange(len(diseases)), len(confidences))
+        conf = np.tile(np.array(confidences, dtype=np.float64), len(diseases))
+        expected = [baseline_severity(c, classes[p]) for p, c in zip(pred, conf)]
+
+        single = [self.analyzer._determine_severity(c, classes[p]) for p, c in zip(pred, conf)]
+        self.assertEqual(single, expected)
+
+        kernels = [symptom_analyzer._severity_scores, symptom_analyzer._get_severity_kernel()]
+        for kernel in kernels:
+            ids = kernel(pred, conf, mask,
+                         symptom_analyzer._SEVERITY_CUTS, symptom_analyzer._SEVERITY_IDS)
+            self.assertEqual([symptom_analyzer._SEVERITY_LEVELS[i] for i in ids], expected)
+
+    def test_batch_matches_single(self):
+        batch = [["itching", "skin_rash"], [], ["headache"], ["vomiting", "fatigue", "high_fever"]]
+        results = self.analyzer.analyze_symptoms_batch(batch)
+
+        for symptoms, result in zip(batch, results):
+            single = self.analyzer.analyze_symptoms(symptoms)
+            for key in ("analysisDate", "confidence", "confidencePercentage", "topPredictions"):
+                self.assertEqual(key in result, key in single)
+            self.assertAlmostEqual(result.get("confidence", 0), single.get("confidence", 0), places=12)
+            self.assertEqual(
+                [p["disease"] for p in result.get("topPredictions", [])],
+                [p["disease"] for p in single.get("topPredictions", [])]
+            )
+            for key in ("analysisDate", "confidence", "confidencePercentage", "topPredictions"):
+                result.pop(key, None)
+                single.pop(key, None)
+            self.assertEqual(result, single)
+
+
+if __name__ == "__main__":
+    unittest.main()